@@ -1,36 +1,165 @@
+import multiprocessing
 import numpy as np
 import pandas as pd
-from typing import List, Tuple
+from typing import Dict, List, Sequence, Tuple
 from datetime import datetime, timedelta
 
+try:
+    from forecasting_numba import mc_days_to_target
+except ImportError:
+    mc_days_to_target = None
+
+PARALLEL_THRESHOLD = 200_000
+PILOT_SIMULATIONS = 200
+
+
+def _as_sampling_array(completed: pd.Series) -> np.ndarray:
+    # Item counts fit in int32, halving the bytes the sampler gathers versus
+    # int64; story points can be fractional after backfilling, so keep those
+    # as float64.
+    values = completed.to_numpy()
+    if np.all(np.mod(values, 1) == 0):
+        return np.ascontiguousarray(values, dtype=np.int32)
+    return np.ascontiguousarray(values, dtype=np.float64)
+
+
+def _days_to_target(simulations: np.ndarray, target_count: float) -> np.ndarray:
+    # Rows are non-decreasing after cumsum, so the number of days still
+    # below the target is the index of the first day at or above it.
+    # Simulations that never reach it report num_days instead of argmax's
+    # silent 0.
+    return (simulations < target_count).sum(axis=1)
+
+
+def _run_chunk(
+    completed_per_day: np.ndarray,
+    num_days: int,
+    num_simulations: int,
+    seed: int,
+    target_count: float = None,
+) -> np.ndarray:
+    # Module level so multiprocessing can pickle it. Returns only what the
+    # quantiles need: days to target, or the total after num_days.
+    rng = np.random.default_rng(seed)
+    n = len(completed_per_day)
+    cdf = np.arange(1, n + 1) / n
+    idx = np.searchsorted(cdf, rng.random((num_simulations, num_days)), side="right")
+    simulations = np.cumsum(completed_per_day[idx], axis=1, dtype=completed_per_day.dtype)
+    if target_count is not None:
+        return _days_to_target(simulations, target_count)
+    return simulations[:, -1]
+
 
 class MonteCarloForecaster:
-    def __init__(self, num_simulations: int = 10000):
+    def __init__(self, num_simulations: int = 10000, seed: int = None):
         self.num_simulations = num_simulations
+        self.rng = np.random.default_rng(seed)
+        self._cdf = None
+
+    def _get_cdf(self, completed_per_day: np.ndarray) -> np.ndarray:
+        # Every historical day is equally likely, so the CDF only depends on
+        # how many days there are and can be reused across calls.
+        n = len(completed_per_day)
+        if self._cdf is None or len(self._cdf) != n:
+            self._cdf = np.arange(1, n + 1) / n
+        return self._cdf
+
+    def _sample(
+        self, completed_per_day: np.ndarray, num_days: int, num_simulations: int = None
+    ) -> np.ndarray:
+        cdf = self._get_cdf(completed_per_day)
+        u = self.rng.random((num_simulations or self.num_simulations, num_days))
+        idx = np.searchsorted(cdf, u, side="right")
+        return completed_per_day[idx]
 
     def run_simulation(
         self, df: pd.DataFrame, num_days: int = None, target_count: float = None
     ) -> np.ndarray:
-        completed_per_day = df["Completed"].values
+        completed_per_day = _as_sampling_array(df["Completed"])
 
         if num_days is None and target_count is None:
             raise ValueError("Either num_days or target_count must be specified")
 
         if num_days is None:
-            num_days = int(2 * target_count / np.mean(completed_per_day))
+            num_days = self._estimate_num_days(completed_per_day, target_count)
 
-        simulations = np.random.choice(
-            completed_per_day, size=(self.num_simulations, num_days)
-        )
-        simulations = np.cumsum(simulations, axis=1)
+        if target_count is not None and mc_days_to_target is not None:
+            # Fused kernel: draws, accumulates and stops at the target per
+            # simulation without materializing any (simulations, days) matrix.
+            days_to_target = mc_days_to_target(
+                completed_per_day,
+                target_count,
+                num_days,
+                self.rng.integers(2**31, size=self.num_simulations),
+            )
+            return np.quantile(days_to_target, [0.5, 0.75, 0.85, 0.95])
+
+        if self.num_simulations >= PARALLEL_THRESHOLD:
+            return self._run_parallel(completed_per_day, num_days, target_count)
+
+        simulations = self._sample(completed_per_day, num_days)
+        simulations = np.cumsum(simulations, axis=1, dtype=completed_per_day.dtype)
 
         if target_count is not None:
-            days_to_target = np.argmax(simulations >= target_count, axis=1)
+            days_to_target = _days_to_target(simulations, target_count)
             return np.quantile(days_to_target, [0.5, 0.75, 0.85, 0.95])
         else:
+            # Only the final day's totals are reported, so take quantiles of
+            # that column rather than of every day in the matrix.
             return np.quantile(
-                simulations, [0.5, 0.25, 0.15, 0.05], axis=0, method="lower"
-            )[:, -1]
+                simulations[:, -1], [0.5, 0.25, 0.15, 0.05], method="lower"
+            )
+
+    def run_simulation_multi(
+        self, df: pd.DataFrame, day_checkpoints: Sequence[int]
+    ) -> Dict[int, np.ndarray]:
+        # Every horizon reads from one sampled matrix: the total after N days
+        # is column N - 1 of the running sum over the longest horizon.
+        completed_per_day = _as_sampling_array(df["Completed"])
+        simulations = np.cumsum(
+            self._sample(completed_per_day, max(day_checkpoints)),
+            axis=1,
+            dtype=completed_per_day.dtype,
+        )
+        columns = np.asarray(day_checkpoints) - 1
+        percentiles = np.quantile(
+            simulations[:, columns], [0.5, 0.25, 0.15, 0.05], axis=0, method="lower"
+        )
+        return {days: percentiles[:, i] for i, days in enumerate(day_checkpoints)}
+
+    def _estimate_num_days(
+        self, completed_per_day: np.ndarray, target_count: float
+    ) -> int:
+        # Size the horizon from a small pilot run: the 99th percentile of days
+        # to target plus 20%. A fixed multiple of the mean rate either leaves
+        # slow runs short of the target or allocates far more days than needed.
+        pilot_days = max(int(4 * target_count / np.mean(completed_per_day)), 1)
+        pilot = np.cumsum(
+            self._sample(completed_per_day, pilot_days, PILOT_SIMULATIONS),
+            axis=1,
+            dtype=completed_per_day.dtype,
+        )
+        days_to_target = _days_to_target(pilot, target_count)
+        return int(np.quantile(days_to_target, 0.99) * 1.2) + 1
+
+    def _run_parallel(
+        self, completed_per_day: np.ndarray, num_days: int, target_count: float
+    ) -> np.ndarray:
+        workers = multiprocessing.cpu_count()
+        base, extra = divmod(self.num_simulations, workers)
+        seeds = self.rng.integers(2**31, size=workers)
+        chunks = [
+            (completed_per_day, num_days, base + (i < extra), int(seeds[i]), target_count)
+            for i in range(workers)
+        ]
+        # spawn rather than fork: forking after the parallel numba kernel has
+        # started its threading layer can deadlock the children
+        with multiprocessing.get_context("spawn").Pool(workers) as pool:
+            results = np.concatenate(pool.starmap(_run_chunk, chunks))
+
+        if target_count is not None:
+            return np.quantile(results, [0.5, 0.75, 0.85, 0.95])
+        return np.quantile(results, [0.5, 0.25, 0.15, 0.05], method="lower")
 
     def forecast_completed_items(self, df: pd.DataFrame, num_days: int) -> List[float]:
         return self.run_simulation(df, num_days=num_days)
@@ -0,0 +1,21 @@
+import numpy as np
+from numba import njit, prange
+
+
+@njit(parallel=True, fastmath=True, cache=True)
+def mc_days_to_target(completed, target, max_days, seeds):
+    # np.random.seed only seeds the calling thread, so each simulation seeds
+    # its own draw from a per-row seed; the result then does not depend on
+    # which worker thread runs the row.
+    n = len(completed)
+    nsim = len(seeds)
+    out = np.full(nsim, max_days, dtype=np.int64)
+    for i in prange(nsim):
+        np.random.seed(seeds[i])
+        s = 0.0
+        for d in range(max_days):
+            s += completed[np.random.randint(n)]
+            if s >= target:
+                out[i] = d
+                break
+    return out
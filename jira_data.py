@@ -1,17 +1,26 @@
 import configparser
 from requests.exceptions import RequestException
 import concurrent.futures
-from typing import List, Tuple, Optional, Dict
+from itertools import chain
+from typing import List, Tuple, Optional, Dict, Set
 import logging
-import pytz
-from datetime import datetime, timedelta
+import time
+from datetime import datetime, timedelta, timezone
 import pandas as pd
 import numpy as np
+import orjson
 import requests
+from requests.adapters import HTTPAdapter
 from requests.auth import HTTPBasicAuth
 
 logger = logging.getLogger(__name__)
 
+FETCH_WORKERS = 8
+FILTER_CACHE_TTL = 300
+
+FULL_TICKET_FIELDS = ["key", "customfield_10026", "customfield_10082", "created", "resolutiondate", "assignee", "summary", "description", "status"]
+LITE_TICKET_FIELDS = ["key", "customfield_10026", "created", "resolutiondate", "assignee"]
+
 def load_config() -> configparser.ConfigParser:
     config = configparser.ConfigParser()
     config.read("config.ini")
@@ -25,204 +34,243 @@ class JiraDataManager:
         self.auth = HTTPBasicAuth(email, api_key)
         self.base_url = self.config['Jira']['base_url']
         self.done_status = done_status
+        self._account_id = None
+        self._filter_list = None
+        self._filter_list_fetched_at = 0.0
+
+        # One pooled session keeps TLS connections alive across requests and
+        # is shared by the page-fetching worker threads.
+        self.session = requests.Session()
+        self.session.auth = self.auth
+        self.session.headers.update({"Accept": "application/json"})
+        adapter = HTTPAdapter(pool_connections=16, pool_maxsize=16)
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
 
     def get_filter_list(self) -> List[Tuple[str, str]]:
+        # Listing filters is a network round trip and the prompts may ask for
+        # it repeatedly, so reuse a recent result. Failures return [] and are
+        # retried on the next call.
+        if not self._filter_list or time.monotonic() - self._filter_list_fetched_at > FILTER_CACHE_TTL:
+            self._filter_list = self._fetch_filter_list()
+            self._filter_list_fetched_at = time.monotonic()
+        return self._filter_list
+
+    def _fetch_filter_list(self) -> List[Tuple[str, str]]:
         url = f"{self.base_url}/rest/api/3/filter/search"
-        headers = {"Accept": "application/json"}
         params = {"accountId": self.get_account_id()}
-        response = requests.get(url, headers=headers, auth=self.auth, params=params)
-        if response.status_code == 200:
-            filters = response.json()["values"]
-            return [(f["id"], f["name"]) for f in filters]
-        else:
+        response = self.session.get(url, params=params)
+        if response.status_code != 200:
             logger.error(f"Error fetching filters: {response.status_code}")
             return []
+        try:
+            filters = orjson.loads(response.content)["values"]
+        except orjson.JSONDecodeError as e:
+            logger.error(f"Error decoding filters: {str(e)}")
+            return []
+        return [(f["id"], f["name"]) for f in filters]
 
     def get_account_id(self) -> str:
+        # The account ID cannot change during a session, so fetch it once.
+        # A failed lookup returns "" and is retried on the next call.
+        if not self._account_id:
+            self._account_id = self._fetch_account_id()
+        return self._account_id
+
+    def _fetch_account_id(self) -> str:
         url = f"{self.base_url}/rest/api/3/myself"
-        headers = {"Accept": "application/json"}
-        response = requests.get(url, headers=headers, auth=self.auth)
-        if response.status_code == 200:
-            return response.json()["accountId"]
-        else:
+        response = self.session.get(url)
+        if response.status_code != 200:
             logger.error(f"Error fetching account ID: {response.status_code}")
             return ""
+        try:
+            return orjson.loads(response.content)["accountId"]
+        except orjson.JSONDecodeError as e:
+            logger.error(f"Error decoding account ID: {str(e)}")
+            return ""
 
-    def get_ticket_data(self, filter_id: str) -> List[Dict]:
+    def _fetch_ticket_page(self, filter_id: str, start_at: int, max_results: int, need_changelog: bool) -> Dict:
         url = f"{self.base_url}/rest/api/2/search"
 
-        headers = {
-            "Content-Type": "application/json",
-            "Accept": "application/json"
+        payload = {
+            "jql": f"filter={filter_id}",
+            "fields": FULL_TICKET_FIELDS if need_changelog else LITE_TICKET_FIELDS,
+            "startAt": start_at,
+            "maxResults": max_results
         }
-        
-        all_issues = []
-        start_at = 0
+        if need_changelog:
+            payload["expand"] = ["changelog"]
+
+        response = self.session.post(url, json=payload)
+        response.raise_for_status()  # Raises an HTTPError for bad responses
+        return orjson.loads(response.content)
+
+    def get_ticket_data(self, filter_id: str, need_changelog: bool = False) -> List[Dict]:
+        # The changelog dominates response size and is only needed for cycle
+        # time statistics; forecasting only uses resolution dates and points.
         max_results = 100  # Increased from 50 to 100 for efficiency
 
-        while True:
-            payload = {
-                "jql": f"filter={filter_id}",
-                "fields": ["key", "customfield_10026", "customfield_10082", "created", "resolutiondate", "assignee", "summary", "description", "status"],
-                "expand": ["changelog"],
-                "startAt": start_at,
-                "maxResults": max_results
-            }
-            
-            try:
-                response = requests.post(url, json=payload, headers=headers, auth=self.auth)
-                response.raise_for_status()  # Raises an HTTPError for bad responses
-                
-                data = response.json()
-                issues = data["issues"]
-                
-                for issue in issues:
-                    logger.debug(f"Received issue: Key: {issue['key']}, Story Points: {issue['fields'].get('customfield_10026')}")
-                
-                processed_issues = self.process_issues(issues)
-                all_issues.extend(processed_issues)
-                
-                if len(issues) < max_results or len(all_issues) >= data["total"]:
-                    break
-                
-                start_at += len(issues)
-            
-            except RequestException as e:
-                logger.error(f"Error fetching tickets: {str(e)}")
-                break
+        try:
+            data = self._fetch_ticket_page(filter_id, 0, max_results, need_changelog)
+        except (RequestException, orjson.JSONDecodeError) as e:
+            logger.error(f"Error fetching tickets: {str(e)}")
+            return []
+
+        pages = [data["issues"]]
+
+        # The first page tells us the total, so the remaining pages can be
+        # requested concurrently. Jira may cap the page size below max_results.
+        page_size = len(data["issues"])
+        offsets = range(page_size, data["total"], page_size) if page_size else []
+
+        with concurrent.futures.ThreadPoolExecutor(max_workers=FETCH_WORKERS) as executor:
+            futures = [executor.submit(self._fetch_ticket_page, filter_id, offset, page_size, need_changelog) for offset in offsets]
+            for future in futures:
+                try:
+                    pages.append(future.result()["issues"])
+                except (RequestException, orjson.JSONDecodeError) as e:
+                    logger.error(f"Error fetching tickets: {str(e)}")
+
+        all_issues = []
+        for issues in pages:
+            for issue in issues:
+                logger.debug(f"Received issue: Key: {issue['key']}, Story Points: {issue['fields'].get('customfield_10026')}")
+
+            all_issues.extend(self.process_issues(issues, need_changelog))
 
         logger.info(f"Retrieved {len(all_issues)} issues in total")
         return all_issues
 
 
-    def process_issues(self, issues: List[Dict]) -> List[Dict]:
+    def process_issues(self, issues: List[Dict], need_changelog: bool = True) -> List[Dict]:
+        fields = [issue["fields"] for issue in issues]
+
+        # Jira timestamps carry the site's UTC offset, so the date prefix is the
+        # local calendar day. Parse the whole page in one call per column.
+        created_dates = pd.to_datetime([f["created"][:10] for f in fields], format="%Y-%m-%d").date
+        resolved_dates = pd.to_datetime(
+            [f["resolutiondate"][:10] if f["resolutiondate"] else None for f in fields], format="%Y-%m-%d"
+        ).date
+        description_lengths = [len(f.get("description") or "") for f in fields]
+        acceptance_criteria_lengths = [len(f.get("customfield_10082", "") or "") for f in fields]
+
         processed_issues = []
-        for issue in issues:
-            cycle_times, backlog_to_progress = self.calculate_cycle_times(issue["changelog"]["histories"])
+        for i, issue in enumerate(issues):
+            issue_fields = fields[i]
+            if need_changelog:
+                cycle_times, backlog_to_progress = self.calculate_cycle_times(issue["changelog"]["histories"])
+                cycle_time = sum(cycle_times.values(), timedelta())
+            else:
+                cycle_times, backlog_to_progress, cycle_time = {}, 0, None
             processed_issue = {
                 "key": issue["key"],
-                "story_points": issue["fields"].get("customfield_10026", 0) or 0,  # Use 0 if None or falsy
-                "summary": issue["fields"].get("summary", ""),
-                "created_date": pd.to_datetime(issue["fields"]["created"]).date(),
-                "completed_date": pd.to_datetime(issue["fields"]["resolutiondate"]).date() if issue["fields"]["resolutiondate"] else None,
-                "assignee": issue["fields"]["assignee"]["displayName"] if issue["fields"]["assignee"] else None,
-                "description_length": len(issue["fields"]["description"] or ""),
-                "acceptance_criteria": issue["fields"].get("customfield_10082", ""),
-                "acceptance_criteria_length": len(issue["fields"].get("customfield_10082", "") or ""),
+                "story_points": issue_fields.get("customfield_10026", 0) or 0,  # Use 0 if None or falsy
+                "summary": issue_fields.get("summary", ""),
+                "created_date": created_dates[i],
+                "completed_date": resolved_dates[i] if issue_fields["resolutiondate"] else None,
+                "assignee": issue_fields["assignee"]["displayName"] if issue_fields["assignee"] else None,
+                "description_length": description_lengths[i],
+                "acceptance_criteria": issue_fields.get("customfield_10082", ""),
+                "acceptance_criteria_length": acceptance_criteria_lengths[i],
                 "cycle_times": cycle_times,
+                "cycle_time": cycle_time,
                 "backlog_to_progress": backlog_to_progress
             }
             processed_issues.append(processed_issue)
         return processed_issues
 
     def calculate_cycle_times(self, changelog: List[Dict]) -> Tuple[Dict[str, timedelta], int]:
-            status_changes = []
-            current_status = None
-            backlog_to_progress_count = 0
-
-            for history in changelog:
-                for item in history["items"]:
-                    if item["field"] == "status":
-                        timestamp = pd.to_datetime(history["created"]).tz_convert(pytz.UTC)
-                        from_status = item["fromString"]
-                        to_status = item["toString"]
-                        status_changes.append((timestamp, from_status, to_status))
-
-                        if from_status == "Backlog" and to_status == "In Progress":
-                            backlog_to_progress_count += 1
-
-            status_changes.sort(key=lambda x: x[0])
-
-            cycle_times = {}
-            status_start_times = {}
-
-            for timestamp, from_status, to_status in status_changes:
-                if from_status in status_start_times:
-                    duration = timestamp - status_start_times[from_status]
-                    if from_status in cycle_times:
-                        cycle_times[from_status] += duration
-                    else:
-                        cycle_times[from_status] = duration
-                    del status_start_times[from_status]
-
-                status_start_times[to_status] = timestamp
-
-            # Add time for the current status
-            current_time = pd.Timestamp.now(tz=pytz.UTC)
-            for status, start_time in status_start_times.items():
-                duration = current_time - start_time
-                if status in cycle_times:
-                    cycle_times[status] += duration
-                else:
-                    cycle_times[status] = duration
-
-            return cycle_times, backlog_to_progress_count
-
-    def get_unresolved_count(self, filter_id: str) -> Tuple[int, float]:
-       url = f"{self.base_url}/rest/api/2/search"
-       headers = {"Content-Type": "application/json"}
-       params = {
-           "jql": f"filter={filter_id} AND resolution IS EMPTY",
-           "fields": "customfield_10026",
-           "maxResults": 1000
-       }
-
-       item_count = 0
-       story_point_sum = 0
-       start_at = 0
+        created, from_statuses, to_statuses = [], [], []
+        for history in changelog:
+            for item in history["items"]:
+                if item["field"] == "status":
+                    created.append(history["created"])
+                    from_statuses.append(item["fromString"])
+                    to_statuses.append(item["toString"])
+
+        from_statuses = np.array(from_statuses, dtype=object)
+        to_statuses = np.array(to_statuses, dtype=object)
+        backlog_to_progress_count = int(np.sum((from_statuses == "Backlog") & (to_statuses == "In Progress")))
+
+        # Parse every timestamp in one call and work in integer nanoseconds so
+        # the accumulation loop below makes no pandas calls. asi8 is in the
+        # index's own resolution (microseconds for parsed strings on pandas 3),
+        # so pin it to nanoseconds to match Timestamp.value and Timedelta below.
+        timestamps = pd.to_datetime(created, utc=True).as_unit("ns").asi8
+        order = np.argsort(timestamps, kind="stable")
+
+        cycle_ns = {}
+        status_start_ns = {}
+
+        for timestamp, from_status, to_status in zip(
+            timestamps[order].tolist(), from_statuses[order].tolist(), to_statuses[order].tolist()
+        ):
+            if from_status in status_start_ns:
+                cycle_ns[from_status] = cycle_ns.get(from_status, 0) + timestamp - status_start_ns.pop(from_status)
+
+            status_start_ns[to_status] = timestamp
+
+        # Add time for the current status
+        current_ns = pd.Timestamp.now(tz=timezone.utc).value
+        for status, start_ns in status_start_ns.items():
+            cycle_ns[status] = cycle_ns.get(status, 0) + current_ns - start_ns
+
+        cycle_times = {status: pd.Timedelta(ns, unit="ns") for status, ns in cycle_ns.items()}
+        return cycle_times, backlog_to_progress_count
+
+    def calculate_combined_cycle_time(self, cycle_times: Dict[str, timedelta], selected_statuses: Set[str]) -> timedelta:
+        return sum((time for status, time in cycle_times.items() if status in selected_statuses), timedelta())
+
+    def _get_unresolved_issues(self, filter_id: str) -> Optional[List[Dict]]:
+        url = f"{self.base_url}/rest/api/2/search"
+        params = {
+            "jql": f"filter={filter_id} AND resolution IS EMPTY",
+            "fields": "customfield_10026",
+            "maxResults": 1000
+        }
 
-       while True:
-           params["startAt"] = start_at
-           response = requests.get(url, headers=headers, params=params, auth=self.auth)
+        def fetch_page(start_at: int) -> Optional[Dict]:
+            response = self.session.get(url, params={**params, "startAt": start_at})
+            if response.status_code != 200:
+                logger.error(f"Error fetching unresolved tickets: {response.status_code}")
+                return None
+            try:
+                return orjson.loads(response.content)
+            except orjson.JSONDecodeError as e:
+                logger.error(f"Error decoding unresolved tickets: {str(e)}")
+                return None
 
-           if response.status_code != 200:
-               logger.error(f"Error fetching unresolved tickets: {response.status_code}")
-               return 0, 0
+        data = fetch_page(0)
+        if data is None:
+            return None
 
-           data = response.json()
-           issues = data["issues"]
+        issues = list(data["issues"])
+        page_size = len(data["issues"])
+        offsets = range(page_size, data["total"], page_size) if page_size else []
 
-           item_count += len(issues)
-           story_point_sum += sum(issue["fields"].get("customfield_10026", 0) or 0 for issue in issues)
+        with concurrent.futures.ThreadPoolExecutor(max_workers=FETCH_WORKERS) as executor:
+            for page in executor.map(fetch_page, offsets):
+                if page is None:
+                    return None
+                issues.extend(page["issues"])
 
-           if len(issues) < 1000:
-               break
+        return issues
 
-           start_at += len(issues)
+    def get_unresolved_count(self, filter_id: str) -> Tuple[int, float]:
+        issues = self._get_unresolved_issues(filter_id)
+        if issues is None:
+            return 0, 0
 
-       return item_count, story_point_sum
+        item_count = len(issues)
+        story_point_sum = sum(issue["fields"].get("customfield_10026", 0) or 0 for issue in issues)
+        return item_count, story_point_sum
 
     def get_story_points(self, filter_id: str) -> List[Optional[float]]:
-        url = f"{self.base_url}/rest/api/2/search"
-        headers = {"Content-Type": "application/json"}
-        params = {
-            "jql": f"filter={filter_id} AND resolution IS EMPTY",
-            "fields": "customfield_10026",
-            "maxResults": 1000
-        }
-        
-        story_points = []
-        start_at = 0
-        
-        while True:
-            params["startAt"] = start_at
-            response = requests.get(url, headers=headers, params=params, auth=self.auth)
-            
-            if response.status_code != 200:
-                logger.error(f"Error fetching story points: {response.status_code}")
-                return []
-            
-            data = response.json()
-            issues = data['issues']
-            
-            story_points.extend([issue['fields'].get('customfield_10026') for issue in issues])
-            
-            if len(issues) < 1000:
-                break
-            
-            start_at += len(issues)
-        
-        return story_points
+        issues = self._get_unresolved_issues(filter_id)
+        if issues is None:
+            return []
+
+        return [issue['fields'].get('customfield_10026') for issue in issues]
 
     def backfill_story_points(self, tickets: List[dict]) -> List[dict]:
         valid_points = [
@@ -267,20 +315,20 @@ class JiraDataManager:
         logger.info(f"Data spans from {earliest_date} to {latest_date}")
         logger.info(f"Total completed tickets in this period: {len(closed_tickets)}")
 
-        date_range = pd.date_range(start=earliest_date, end=latest_date, freq="D")
-        df_items = pd.DataFrame(index=date_range, columns=["Completed"])
-        df_points = pd.DataFrame(index=date_range, columns=["Completed"])
-        df_items.index.name = df_points.index.name = "Date"
-        df_items["Completed"] = df_points["Completed"] = 0  # Initialize all days with 0 completed items/points
-
-        for ticket in closed_tickets:
-            closed_timestamp = pd.Timestamp(ticket['completed_date'])
-            if closed_timestamp in df_items.index:
-                df_items.at[closed_timestamp, 'Completed'] += 1
-                df_points.at[closed_timestamp, 'Completed'] += ticket['story_points']
-            else:
-                logger.warning(f"Date {closed_timestamp} not in date range.")
-                
+        date_range = pd.date_range(start=earliest_date, end=latest_date, freq="D", name="Date")
+        completed_dates = pd.to_datetime([t['completed_date'] for t in closed_tickets])
+        story_points = np.array([t['story_points'] for t in closed_tickets], dtype=float)
+
+        # Aggregate per day in one groupby and fill days with no completions with 0
+        df_items = (
+            pd.Series(1, index=completed_dates).groupby(level=0).sum()
+            .reindex(date_range, fill_value=0).to_frame("Completed")
+        )
+        df_points = (
+            pd.Series(story_points, index=completed_dates).groupby(level=0).sum()
+            .reindex(date_range, fill_value=0).to_frame("Completed")
+        )
+
         df_items["Cumulative Completed"] = df_items["Completed"].cumsum()
         df_points["Cumulative Completed"] = df_points["Completed"].cumsum()
 
@@ -291,25 +339,67 @@ class JiraDataManager:
 
         return df_items, df_points
 
+    def build_ticket_frames(self, tickets: List[Dict]) -> Tuple[pd.DataFrame, pd.DataFrame]:
+        # Columnar views of the processed tickets for vectorized analysis: one
+        # row per ticket with typed columns, plus one row per (ticket, status)
+        # whose "ticket" column is the position of the ticket in the first frame.
+        tickets_df = pd.DataFrame({
+            "key": [t["key"] for t in tickets],
+            "assignee": [t["assignee"] for t in tickets],
+            "completed_date": pd.to_datetime([t["completed_date"] for t in tickets]),
+            "story_points": np.array([t["story_points"] for t in tickets], dtype=np.float64),
+            "original_story_points": pd.array([t.get("original_story_points") for t in tickets], dtype="boolean"),
+            "backlog_to_progress": np.array([t["backlog_to_progress"] for t in tickets], dtype=np.int32),
+            "cycle_time": pd.to_timedelta([t.get("cycle_time") for t in tickets]),
+            "acceptance_criteria_length": np.array([t["acceptance_criteria_length"] for t in tickets], dtype=np.int64),
+            "description_length": np.array([t["description_length"] for t in tickets], dtype=np.int64),
+        })
+
+        # Statuses repeat across every ticket, so store them as codes into one
+        # shared status list rather than as per-row strings. The list keeps
+        # first-seen (workflow) order, which is the order reports print in.
+        status_counts = [len(t["cycle_times"]) for t in tickets]
+        statuses = list(dict.fromkeys(chain.from_iterable(t["cycle_times"] for t in tickets)))
+        status_index = {status: i for i, status in enumerate(statuses)}
+        cycle_times_df = pd.DataFrame({
+            "ticket": np.repeat(np.arange(len(tickets)), status_counts),
+            "status": pd.Categorical.from_codes(
+                np.fromiter(
+                    (status_index[status] for t in tickets for status in t["cycle_times"]),
+                    dtype=np.int32,
+                    count=sum(status_counts),
+                ),
+                categories=statuses,
+            ),
+            "seconds": np.fromiter(
+                (time.total_seconds() for t in tickets for time in t["cycle_times"].values()),
+                dtype=np.float64,
+                count=sum(status_counts),
+            ),
+        })
+
+        return tickets_df, cycle_times_df
+
     def get_correlations(self, tickets: List[Dict]) -> Dict:
-        df = pd.DataFrame(tickets)
-        
         correlations = {}
-        
-        def timedelta_to_seconds(td):
-            return td.total_seconds() if pd.notnull(td) else pd.NaT
-
-        if 'acceptance_criteria_length' in df.columns and 'cycle_time' in df.columns:
-            cycle_times = df['cycle_time'].apply(timedelta_to_seconds)
-            correlations['acceptance_criteria_cycle_time'] = df['acceptance_criteria_length'].corr(cycle_times)
-
-        if 'description_length' in df.columns and 'cycle_time' in df.columns:
-            cycle_times = df['cycle_time'].apply(timedelta_to_seconds)
-            correlations['description_cycle_time'] = df['description_length'].corr(cycle_times)
-
-        if 'story_points' in df.columns and 'cycle_time' in df.columns:
-            df_with_points = df.dropna(subset=['story_points', 'cycle_time'])
-            cycle_times = df_with_points['cycle_time'].apply(timedelta_to_seconds)
-            correlations['story_points_cycle_time'] = df_with_points['story_points'].corr(cycle_times)
+        if not tickets or tickets[0].get('cycle_time') is None:
+            return correlations
+
+        # Only extract the columns being correlated rather than every ticket field
+        columns = [c for c in ('acceptance_criteria_length', 'description_length', 'story_points') if c in tickets[0]]
+        df = pd.DataFrame.from_records(tickets, columns=columns + ['cycle_time'])
+
+        # Convert once, then get every correlation from one pairwise corr call
+        if not pd.api.types.is_timedelta64_dtype(df['cycle_time']):
+            df['cycle_time'] = pd.to_timedelta(df['cycle_time'])
+        df['cycle_time'] = df['cycle_time'].dt.total_seconds()
+        corr = df.corr()['cycle_time']
+
+        if 'acceptance_criteria_length' in columns:
+            correlations['acceptance_criteria_cycle_time'] = corr['acceptance_criteria_length']
+        if 'description_length' in columns:
+            correlations['description_cycle_time'] = corr['description_length']
+        if 'story_points' in columns:
+            correlations['story_points_cycle_time'] = corr['story_points']
 
         return correlations
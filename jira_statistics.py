@@ -1,12 +1,20 @@
 import logging
-from typing import List, Dict, Set
-from collections import defaultdict
+from typing import Iterable, List, Dict, Set
 from datetime import datetime, timedelta
 import pandas as pd
 import numpy as np
 
+try:
+    from statistics_numba import group_cycle_stats
+except ImportError:
+    group_cycle_stats = None
+
 logger = logging.getLogger(__name__)
 
+# Below this many (ticket, status) rows the groupby reductions finish
+# before the numba kernel's first-call compile would
+CYCLE_STATS_JIT_THRESHOLD = 10_000
+
 
 class JiraStatistics:
     def __init__(self, jira_manager):
@@ -15,248 +23,343 @@ class JiraStatistics:
     def get_filter_statistics(
         self, tickets: List[Dict], selected_statuses: Set[str] = None
     ) -> Dict:
+        # Both the combined stats and the contributor breakdown need each
+        # ticket's combined time; compute it once and share it.
+        combined_seconds = (
+            self.get_combined_cycle_seconds(tickets, selected_statuses)
+            if selected_statuses
+            else None
+        )
+        df, cycle_df = self.jira_manager.build_ticket_frames(tickets)
+
         stats = {
-            "cycle_time": self.calculate_cycle_time_stats(tickets),
+            "cycle_time": self.calculate_cycle_time_stats(tickets, df, cycle_df),
             "combined_cycle_time": (
-                self.calculate_combined_cycle_time_stats(tickets, selected_statuses)
+                self.calculate_combined_cycle_time_stats(
+                    tickets, selected_statuses, combined_seconds
+                )
                 if selected_statuses
                 else None
             ),
-            "contributors": self.analyze_contributors(tickets, selected_statuses),
-            "ticket_range": self.get_ticket_range(tickets),
-            "story_points": self.analyze_story_points(tickets),
-            "correlations": self.get_correlations(tickets),
-            "backlog_to_progress": self.analyze_backlog_to_progress(tickets),
+            "contributors": self.analyze_contributors(
+                tickets, selected_statuses, combined_seconds, df, cycle_df
+            ),
+            "ticket_range": self.get_ticket_range(tickets, df),
+            "story_points": self.analyze_story_points(tickets, df),
+            "correlations": self.get_correlations(tickets, df),
+            "backlog_to_progress": self.analyze_backlog_to_progress(tickets, df),
         }
 
-        logger.debug(f"Generated statistics: {stats}")
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("Generated statistics: %r", stats)
 
         return stats
 
-    def calculate_combined_cycle_time_stats(
+    def get_combined_cycle_seconds(
         self, tickets: List[Dict], selected_statuses: Set[str]
+    ) -> np.ndarray:
+        return np.fromiter(
+            (
+                self.jira_manager.calculate_combined_cycle_time(
+                    ticket["cycle_times"], selected_statuses
+                ).total_seconds()
+                for ticket in tickets
+            ),
+            dtype=np.float64,
+            count=len(tickets),
+        )
+
+    def calculate_combined_cycle_time_stats(
+        self,
+        tickets: List[Dict],
+        selected_statuses: Set[str],
+        combined_seconds: np.ndarray = None,
     ) -> Dict:
         logger.info(
             f"Calculating combined cycle time statistics for statuses: {', '.join(selected_statuses)}"
         )
-        combined_times = []
-
-        for ticket in tickets:
-            combined_time = self.jira_manager.calculate_combined_cycle_time(
-                ticket["cycle_times"], selected_statuses
+        if combined_seconds is None:
+            combined_seconds = self.get_combined_cycle_seconds(
+                tickets, selected_statuses
             )
-            combined_times.append(combined_time.total_seconds())
+
+        n = combined_seconds.size
+        if n > 32:
+            # One partition places min, median and max at known positions
+            k = n // 2
+            part = np.partition(combined_seconds, [0, k - 1, k, n - 1])
+            minimum, maximum = part[0], part[-1]
+            median = part[k] if n % 2 else (part[k - 1] + part[k]) / 2
+        else:
+            minimum, maximum = combined_seconds.min(), combined_seconds.max()
+            median = np.median(combined_seconds)
 
         return {
-            "average": timedelta(seconds=np.mean(combined_times)),
-            "median": timedelta(seconds=np.median(combined_times)),
-            "std_dev": timedelta(seconds=np.std(combined_times)),
-            "min": timedelta(seconds=np.min(combined_times)),
-            "max": timedelta(seconds=np.max(combined_times)),
+            "average": timedelta(seconds=combined_seconds.mean()),
+            "median": timedelta(seconds=median),
+            "std_dev": timedelta(seconds=combined_seconds.std()),
+            "min": timedelta(seconds=minimum),
+            "max": timedelta(seconds=maximum),
         }
 
-    def calculate_cycle_time_stats(self, tickets: List[Dict]) -> Dict:
+    def calculate_cycle_time_stats(
+        self,
+        tickets: List[Dict],
+        df: pd.DataFrame = None,
+        cycle_df: pd.DataFrame = None,
+    ) -> Dict:
         logger.info("Calculating cycle time statistics")
-        all_cycle_times = defaultdict(list)
+        if df is None or cycle_df is None:
+            df, cycle_df = self.jira_manager.build_ticket_frames(tickets)
+        if cycle_df.empty:
+            return {}
 
-        for ticket in tickets:
-            for status, time in ticket["cycle_times"].items():
-                all_cycle_times[status].append((time.total_seconds(), ticket["key"]))
+        keys = df["key"].to_numpy()[cycle_df["ticket"].to_numpy()]
+        grouped = cycle_df.groupby("status", sort=False, observed=True)["seconds"]
+        if group_cycle_stats is not None and len(cycle_df) >= CYCLE_STATS_JIT_THRESHOLD:
+            # One compiled pass over the status codes for everything but the
+            # median, instead of a separate groupby reduction per statistic
+            statuses = cycle_df["status"].cat.categories
+            counts, means, stds, mins, maxs, argmins, argmaxs = group_cycle_stats(
+                cycle_df["status"].cat.codes.to_numpy(),
+                cycle_df["seconds"].to_numpy(),
+                len(statuses),
+            )
+            present = counts > 0
+            rows = zip(
+                statuses[present],
+                means[present],
+                grouped.median().reindex(statuses[present]).to_numpy(),
+                stds[present],
+                mins[present],
+                maxs[present],
+                keys[argmins[present]],
+                keys[argmaxs[present]],
+            )
+        else:
+            means = grouped.mean()
+            rows = zip(
+                means.index,
+                means.to_numpy(),
+                grouped.median().to_numpy(),
+                grouped.std(ddof=0).to_numpy(),  # population std, as np.std
+                grouped.min().to_numpy(),
+                grouped.max().to_numpy(),
+                keys[grouped.idxmin().to_numpy()],
+                keys[grouped.idxmax().to_numpy()],
+            )
 
         cycle_time_stats = {}
-        for status, times in all_cycle_times.items():
-            times_seconds = [t[0] for t in times]
+        for status, mean, median, std, mn, mx, min_key, max_key in rows:
             cycle_time_stats[status] = {
-                "average": timedelta(seconds=np.mean(times_seconds)),
-                "median": timedelta(seconds=np.median(times_seconds)),
-                "std_dev": timedelta(seconds=np.std(times_seconds)),
-                "min": timedelta(seconds=min(times_seconds)),
-                "min_ticket": min(times, key=lambda x: x[0])[1],
-                "max": timedelta(seconds=max(times_seconds)),
-                "max_ticket": max(times, key=lambda x: x[0])[1],
+                "average": timedelta(seconds=mean),
+                "median": timedelta(seconds=median),
+                "std_dev": timedelta(seconds=std),
+                "min": timedelta(seconds=mn),
+                "min_ticket": min_key,
+                "max": timedelta(seconds=mx),
+                "max_ticket": max_key,
             }
 
         return cycle_time_stats
 
-    def get_ticket_range(self, tickets: List[Dict]) -> Dict:
+    def get_ticket_range(self, tickets: List[Dict], df: pd.DataFrame = None) -> Dict:
         logger.info("Determining first and last completed tickets")
-        completed_tickets = [t for t in tickets if t["completed_date"]]
+        if df is None:
+            df, _ = self.jira_manager.build_ticket_frames(tickets)
 
-        if not completed_tickets:
+        completed_dates = df["completed_date"]
+        if not completed_dates.notna().any():
             logger.warning("No completed tickets found.")
             return {}
 
-        first_ticket = min(completed_tickets, key=lambda x: x["completed_date"])
-        last_ticket = max(completed_tickets, key=lambda x: x["completed_date"])
+        # idxmin/idxmax skip missing dates and return the first of any ties
+        first = completed_dates.idxmin()
+        last = completed_dates.idxmax()
 
         return {
             "first_ticket": {
-                "key": first_ticket["key"],
-                "completion_date": first_ticket["completed_date"],
+                "key": df.at[first, "key"],
+                "completion_date": completed_dates[first].date(),
             },
             "last_ticket": {
-                "key": last_ticket["key"],
-                "completion_date": last_ticket["completed_date"],
+                "key": df.at[last, "key"],
+                "completion_date": completed_dates[last].date(),
             },
         }
 
-    def analyze_backlog_to_progress(self, tickets: List[Dict]) -> Dict:
+    def analyze_backlog_to_progress(
+        self, tickets: List[Dict], df: pd.DataFrame = None
+    ) -> Dict:
         logger.info("Analyzing backlog to progress transitions")
-        transitions = [ticket["backlog_to_progress"] for ticket in tickets]
+        if df is None:
+            df, _ = self.jira_manager.build_ticket_frames(tickets)
+        transitions = df["backlog_to_progress"].to_numpy(dtype=np.int64)
+        if transitions.size == 0:
+            return {
+                "total_transitions": 0,
+                "tickets_with_transitions": 0,
+                "max_transitions": 0,
+                "average_transitions": 0.0,
+            }
         return {
-            "total_transitions": sum(transitions),
-            "tickets_with_transitions": len([t for t in transitions if t > 0]),
-            "max_transitions": max(transitions),
-            "average_transitions": np.mean(transitions),
+            "total_transitions": int(transitions.sum()),
+            "tickets_with_transitions": int((transitions > 0).sum()),
+            "max_transitions": int(transitions.max()),
+            "average_transitions": float(transitions.mean()),
         }
 
     def analyze_contributors(
-        self, tickets: List[Dict], selected_statuses: Set[str] = None
+        self,
+        tickets: List[Dict],
+        selected_statuses: Set[str] = None,
+        combined_seconds: np.ndarray = None,
+        df: pd.DataFrame = None,
+        cycle_df: pd.DataFrame = None,
     ) -> Dict:
         logger.info("Analyzing contributor statistics")
-        contributors = defaultdict(
-            lambda: {
-                "count": 0,
-                "points": 0,
-                "cycle_times": defaultdict(list),
-                "first_completion": None,
-                "last_completion": None,
-            }
+        if df is None or cycle_df is None:
+            df, cycle_df = self.jira_manager.build_ticket_frames(tickets)
+
+        is_completed = (
+            df["assignee"].fillna("").astype(bool) & df["completed_date"].notna()
+        ).to_numpy()
+        completed = df[is_completed]
+        if completed.empty:
+            return {"count": 0, "details": {}}
+
+        basic = completed.groupby("assignee", sort=False).agg(
+            count=("key", "size"),
+            points=("story_points", "sum"),
+            first_completion=("completed_date", "min"),
+            last_completion=("completed_date", "max"),
+        )
+        basic["first_completion"] = basic["first_completion"].dt.date
+        basic["last_completion"] = basic["last_completion"].dt.date
+
+        # Per-status averages: accumulate seconds into an (assignee, status)
+        # matrix indexed by the shared status codes, keeping only rows of
+        # completed tickets
+        ticket_idx = cycle_df["ticket"].to_numpy()
+        keep = is_completed[ticket_idx]
+        assignee_codes, assignees = pd.factorize(
+            df["assignee"].to_numpy()[ticket_idx[keep]]
         )
+        statuses = cycle_df["status"].cat.categories
+        status_codes = cycle_df["status"].cat.codes.to_numpy()[keep]
+        cells = assignee_codes * len(statuses) + status_codes
+        size = len(assignees) * len(statuses)
+        totals = np.bincount(
+            cells, weights=cycle_df["seconds"].to_numpy()[keep], minlength=size
+        ).reshape(len(assignees), len(statuses))
+        counts = np.bincount(cells, minlength=size).reshape(totals.shape)
+
+        details = basic.to_dict(orient="index")
+        for data in details.values():
+            data["avg_cycle_times"] = {}
+        for i, j in zip(*np.nonzero(counts)):
+            details[assignees[i]]["avg_cycle_times"][statuses[j]] = timedelta(
+                seconds=totals[i, j] / counts[i, j]
+            )
 
-        for ticket in tickets:
-            if ticket["assignee"] and ticket["completed_date"]:
-                assignee = ticket["assignee"]
-                contributors[assignee]["count"] += 1
-                contributors[assignee]["points"] += ticket["story_points"]
-
-                for status, time in ticket["cycle_times"].items():
-                    contributors[assignee]["cycle_times"][status].append(time)
-
-                completion_date = ticket["completed_date"]
-                if (
-                    contributors[assignee]["first_completion"] is None
-                    or completion_date < contributors[assignee]["first_completion"]
-                ):
-                    contributors[assignee]["first_completion"] = completion_date
-                if (
-                    contributors[assignee]["last_completion"] is None
-                    or completion_date > contributors[assignee]["last_completion"]
-                ):
-                    contributors[assignee]["last_completion"] = completion_date
-                if selected_statuses:
-                    combined_time = self.jira_manager.calculate_combined_cycle_time(
-                        ticket["cycle_times"], selected_statuses
-                    )
-                    contributors[assignee]["combined_cycle_times"].append(combined_time)
-
-        for assignee, data in contributors.items():
-            data["avg_cycle_times"] = {
-                status: sum(times, timedelta()) / len(times) if times else timedelta(0)
-                for status, times in data["cycle_times"].items()
-            }
-            if selected_statuses:
-                data["avg_combined_cycle_time"] = (
-                    sum(data["combined_cycle_times"], timedelta())
-                    / len(data["combined_cycle_times"])
-                    if data["combined_cycle_times"]
-                    else timedelta(0)
+        if selected_statuses:
+            if combined_seconds is None:
+                combined_seconds = self.get_combined_cycle_seconds(
+                    tickets, selected_statuses
+                )
+            avg_combined = (
+                pd.Series(combined_seconds[is_completed])
+                .groupby(completed["assignee"].to_numpy(), sort=False)
+                .mean()
+            )
+            for assignee, seconds in avg_combined.items():
+                details[assignee]["avg_combined_cycle_time"] = timedelta(
+                    seconds=seconds
                 )
 
-        return {"count": len(contributors), "details": dict(contributors)}
-
-    def get_ticket_range(self, tickets: List[Dict]) -> Dict:
-        logger.info("Determining first and last completed tickets")
-        completed_tickets = [t for t in tickets if t["completed_date"]]
-
-        if not completed_tickets:
-            logger.warning("No completed tickets found.")
-            return {}
-
-        first_ticket = min(completed_tickets, key=lambda x: x["completed_date"])
-        last_ticket = max(completed_tickets, key=lambda x: x["completed_date"])
-
-        return {
-            "first_ticket": {
-                "key": first_ticket["key"],
-                "completion_date": first_ticket["completed_date"],
-            },
-            "last_ticket": {
-                "key": last_ticket["key"],
-                "completion_date": last_ticket["completed_date"],
-            },
-        }
+        return {"count": len(details), "details": details}
 
-    def analyze_story_points(self, tickets: List[Dict]) -> Dict:
+    def analyze_story_points(
+        self, tickets: List[Dict], df: pd.DataFrame = None
+    ) -> Dict:
         logger.info("Analyzing story point data")
+        if df is None:
+            df, _ = self.jira_manager.build_ticket_frames(tickets)
+
+        if logger.isEnabledFor(logging.DEBUG):
+            for i, ticket in enumerate(tickets):
+                logger.debug(
+                    "Ticket %d: Key: %s, Story Points: %s, Original: %s",
+                    i + 1,
+                    ticket.get("key"),
+                    ticket.get("story_points"),
+                    ticket.get("original_story_points"),
+                )
 
-        for i, ticket in enumerate(tickets):
-            logger.debug(
-                f"Ticket {i+1}: Key: {ticket.get('key')}, Story Points: {ticket.get('story_points')}, Original: {ticket.get('original_story_points')}"
-            )
+        points = df["story_points"].to_numpy(dtype=np.float64)
+        flags = df["original_story_points"]
+        is_original = flags.eq(True).fillna(False).to_numpy(dtype=bool)
+        is_backfilled = flags.eq(False).fillna(False).to_numpy(dtype=bool)
+        original_points = points[is_original]
+        backfilled_points = points[is_backfilled]
 
-        original_tickets = [
-            t for t in tickets if t.get("original_story_points") is True
-        ]
-        backfilled_tickets = [
-            t for t in tickets if t.get("original_story_points") is False
-        ]
-
-        logger.info(f"Original tickets: {len(original_tickets)}")
-        logger.info(f"Backfilled tickets: {len(backfilled_tickets)}")
+        logger.info(f"Original tickets: {original_points.size}")
+        logger.info(f"Backfilled tickets: {backfilled_points.size}")
 
-        total_original_points = sum(t["story_points"] for t in original_tickets)
-        total_backfilled_points = sum(t["story_points"] for t in backfilled_tickets)
+        total_original_points = float(original_points.sum())
+        total_backfilled_points = float(backfilled_points.sum())
         total_all_points = total_original_points + total_backfilled_points
 
         logger.info(f"Total original points: {total_original_points}")
         logger.info(f"Total backfilled points: {total_backfilled_points}")
         logger.info(f"Total all points: {total_all_points}")
 
-        if original_tickets:
-            average_points = np.mean([t["story_points"] for t in original_tickets])
+        if original_points.size:
+            average_points = float(original_points.mean())
         else:
             average_points = None
 
         logger.info(f"Average points: {average_points}")
 
         return {
-            "tickets_with_points": len(original_tickets),
-            "backfilled_tickets": len(backfilled_tickets),
+            "tickets_with_points": int(original_points.size),
+            "backfilled_tickets": int(backfilled_points.size),
             "average_points": average_points,
             "total_original_points": total_original_points,
             "total_backfilled_points": total_backfilled_points,
             "total_all_points": total_all_points,
-            "backfilled_points": len(backfilled_tickets) > 0,
+            "backfilled_points": backfilled_points.size > 0,
         }
 
-    def get_correlations(self, tickets: List[Dict]) -> Dict:
+    def get_correlations(self, tickets: List[Dict], df: pd.DataFrame = None) -> Dict:
         logger.info("Calculating correlations")
-        df = pd.DataFrame(tickets)
-
         correlations = {}
+        # Tickets fetched without a changelog carry no cycle time; skip
+        # building the frame entirely when there is nothing to correlate.
+        if not tickets or tickets[0].get("cycle_time") is None:
+            return correlations
+
+        columns = [
+            c
+            for c in ("acceptance_criteria_length", "description_length", "story_points")
+            if c in tickets[0]
+        ]
+        if df is None:
+            df, _ = self.jira_manager.build_ticket_frames(tickets)
 
-        def timedelta_to_seconds(td):
-            return td.total_seconds() if pd.notnull(td) else pd.NaT
+        # cycle_time is already timedelta64 in the ticket frame, so this is
+        # one pass over the int64 buffer; then one pairwise corr call
+        cycle_seconds = df["cycle_time"].dt.total_seconds()
+        corr = df[columns].assign(cycle_time=cycle_seconds).corr()["cycle_time"]
 
-        if "acceptance_criteria_length" in df.columns and "cycle_time" in df.columns:
-            cycle_times = df["cycle_time"].apply(timedelta_to_seconds)
-            correlations["acceptance_criteria_cycle_time"] = df[
+        if "acceptance_criteria_length" in columns:
+            correlations["acceptance_criteria_cycle_time"] = corr[
                 "acceptance_criteria_length"
-            ].corr(cycle_times)
-
-        if "description_length" in df.columns and "cycle_time" in df.columns:
-            cycle_times = df["cycle_time"].apply(timedelta_to_seconds)
-            correlations["description_cycle_time"] = df["description_length"].corr(
-                cycle_times
-            )
-
-        if "story_points" in df.columns and "cycle_time" in df.columns:
-            df_with_points = df.dropna(subset=["story_points", "cycle_time"])
-            cycle_times = df_with_points["cycle_time"].apply(timedelta_to_seconds)
-            correlations["story_points_cycle_time"] = df_with_points[
-                "story_points"
-            ].corr(cycle_times)
+            ]
+        if "description_length" in columns:
+            correlations["description_cycle_time"] = corr["description_length"]
+        if "story_points" in columns:
+            correlations["story_points_cycle_time"] = corr["story_points"]
 
         return correlations
 
@@ -268,6 +371,20 @@ def format_timedelta(td: timedelta) -> str:
     return f"{days}d {hours}h {minutes}m"
 
 
+def format_timedeltas(tds: Iterable[timedelta]) -> List[str]:
+    # Same format as format_timedelta, with the divmod work done on one array
+    secs = np.floor(
+        np.fromiter((td.total_seconds() for td in tds), dtype=np.float64)
+    ).astype(np.int64)
+    days = secs // 86400
+    hours = (secs % 86400) // 3600
+    minutes = (secs % 3600) // 60
+    return [
+        f"{d}d {h}h {m}m"
+        for d, h, m in zip(days.tolist(), hours.tolist(), minutes.tolist())
+    ]
+
+
 def print_statistics(stats: Dict):
     print("\n=== Jira Filter Statistics ===\n")
 
@@ -302,13 +419,17 @@ def print_statistics(stats: Dict):
     if "contributors" in stats and stats["contributors"]:
         print("\nContributor Statistics:")
         print(f"  Total Contributors: {stats['contributors']['count']}")
-        for assignee, data in stats["contributors"]["details"].items():
+        details = stats["contributors"]["details"]
+        for assignee, data in details.items():
             print(f"  {assignee}:")
             print(f"    Tickets Completed: {data['count']}")
             print(f"    Story Points Completed: {data['points']:.2f}")
             print("    Average Cycle Times:")
-            for status, avg_time in data["avg_cycle_times"].items():
-                print(f"      {status}: {format_timedelta(avg_time)}")
+            avg_cycle_times = data["avg_cycle_times"]
+            for status, text in zip(
+                avg_cycle_times, format_timedeltas(avg_cycle_times.values())
+            ):
+                print(f"      {status}: {text}")
             if "avg_combined_cycle_time" in data:
                 print(
                     f"    Average Combined Cycle Time: {format_timedelta(data['avg_combined_cycle_time'])}"
@@ -1,7 +1,9 @@
 import configparser
+import functools
 import logging
-from typing import List, Dict, Set, Tuple
+from typing import Callable, List, Dict, Set, Tuple
 from collections import defaultdict
+from itertools import chain
 import json
 from datetime import datetime, timedelta
 import pandas as pd
@@ -11,61 +13,92 @@ from jira_data import JiraDataManager
 from forecasting import MonteCarloForecaster
 from jira_statistics import JiraStatistics, format_timedelta, print_statistics
 
+try:
+    from statistics_numba import outlier_mask
+except ImportError:
+    outlier_mask = None
+
 # Set up logging
 logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s")
 logger = logging.getLogger(__name__)
 
+# Below this many tickets the numpy path finishes before the kernel's
+# first-call compile would
+OUTLIER_JIT_THRESHOLD = 10_000
+
 def load_config() -> configparser.ConfigParser:
     config = configparser.ConfigParser()
     config.read("config.ini")
     return config
 
+def make_cached_simulation(forecaster: MonteCarloForecaster, df: pd.DataFrame):
+    # Menu choices repeat the same horizons and targets against the same
+    # history, so reuse earlier results instead of re-running the simulation.
+    # Each prepared frame gets its own cache, so reloaded data starts fresh.
+    @functools.lru_cache(maxsize=32)
+    def simulate(num_days: int = None, target_count: float = None, day_checkpoints: Tuple[int, ...] = None):
+        if day_checkpoints is not None:
+            return forecaster.run_simulation_multi(df, day_checkpoints)
+        return forecaster.run_simulation(df, num_days=num_days, target_count=target_count)
+
+    return simulate
+
 def display_individual_metrics(jira_manager: JiraDataManager, tickets: List[Dict]):
-    contributors = set(ticket['assignee'] for ticket in tickets if ticket['assignee'])
+    by_assignee = defaultdict(list)
+    for ticket in tickets:
+        if ticket['assignee']:
+            by_assignee[ticket['assignee']].append(ticket)
+    contributors = list(by_assignee)
     print("\nAvailable contributors:")
-    for i, contributor in enumerate(contributors, 1):
-        print(f"{i}. {contributor}")
+    for i, (contributor, contributor_tickets) in enumerate(by_assignee.items(), 1):
+        print(f"{i}. {contributor} ({len(contributor_tickets)} tickets)")
     
     choice = input("Enter the number of the contributor to view detailed metrics (or 'q' to quit): ")
     if choice.lower() == 'q':
         return
     
     try:
-        selected_contributor = list(contributors)[int(choice) - 1]
+        selected_contributor = contributors[int(choice) - 1]
     except (ValueError, IndexError):
         print("Invalid selection. Returning to main menu.")
         return
     
-    contributor_tickets = [t for t in tickets if t['assignee'] == selected_contributor]
+    contributor_tickets = by_assignee[selected_contributor]
     
     print(f"\nDetailed metrics for {selected_contributor}:")
     print(f"Total tickets: {len(contributor_tickets)}")
     print(f"Total story points: {sum(t['story_points'] for t in contributor_tickets if t['story_points'] is not None):.2f}")
     
-    for status in set(status for t in contributor_tickets for status in t['cycle_times'].keys()):
-        times = [t['cycle_times'][status] for t in contributor_tickets if status in t['cycle_times']]
-        if times:
-            avg_time = sum(times, timedelta()) / len(times)
+    for status in set(chain.from_iterable(t['cycle_times'] for t in contributor_tickets)):
+        # Seconds go into one array so the mean, min and max (and the tickets
+        # they came from via argmin/argmax) are C-level reductions
+        with_status = [t for t in contributor_tickets if status in t['cycle_times']]
+        if with_status:
+            seconds = np.fromiter((t['cycle_times'][status].total_seconds() for t in with_status), dtype=np.float64, count=len(with_status))
+            min_ticket = with_status[seconds.argmin()]
+            max_ticket = with_status[seconds.argmax()]
+            avg_time = timedelta(seconds=float(seconds.mean()))
             print(f"\n  Status: {status}")
             print(f"    Average time: {format_timedelta(avg_time)}")
-            print(f"    Min time: {format_timedelta(min(times))} (Ticket: {min(contributor_tickets, key=lambda x: x['cycle_times'].get(status, timedelta.max))['key']})")
-            print(f"    Max time: {format_timedelta(max(times))} (Ticket: {max(contributor_tickets, key=lambda x: x['cycle_times'].get(status, timedelta.min))['key']})")
+            print(f"    Min time: {format_timedelta(min_ticket['cycle_times'][status])} (Ticket: {min_ticket['key']})")
+            print(f"    Max time: {format_timedelta(max_ticket['cycle_times'][status])} (Ticket: {max_ticket['key']})")
     
     print("\nTicket IDs:")
     for ticket in contributor_tickets:
         print(f"  {ticket['key']}: {ticket['summary']} (Story Points: {ticket['story_points']})")
 
 def prompt_for_statuses(jira_manager: JiraDataManager, tickets: List[Dict]) -> Set[str]:
-    all_statuses = set()
-    for ticket in tickets:
-        all_statuses.update(ticket['cycle_times'].keys())
+    all_statuses = set(chain.from_iterable(ticket['cycle_times'] for ticket in tickets))
     
+    ordered = sorted(all_statuses)
     print("Available statuses:")
-    for i, status in enumerate(sorted(all_statuses), 1):
+    for i, status in enumerate(ordered, 1):
         print(f"{i}. {status}")
     
     selected_indices = input("Enter the numbers of the statuses you want to combine (comma-separated): ").split(',')
-    selected_statuses = {sorted(all_statuses)[int(i.strip())-1] for i in selected_indices if i.strip().isdigit() and 0 < int(i.strip()) <= len(all_statuses)}
+    tokens = (i.strip() for i in selected_indices)
+    indices = (int(tok) for tok in tokens if tok.isdigit())
+    selected_statuses = {ordered[idx - 1] for idx in indices if 0 < idx <= len(ordered)}
     
     return selected_statuses
 
@@ -86,43 +119,53 @@ def prompt_for_filter(jira_manager: JiraDataManager, prompt_text: str) -> str:
 def remove_outliers(tickets: List[Dict], iqr_multiplier: float = 1.5) -> Tuple[List[Dict], List[Dict]]:
     logger.info(f"Removing outliers using IQR method with multiplier {iqr_multiplier}")
     
-    def calculate_iqr_bounds(data):
-        q1, q3 = np.percentile(data, [25, 75])
-        iqr = q3 - q1
-        lower_bound = q1 - (iqr_multiplier * iqr)
-        upper_bound = q3 + (iqr_multiplier * iqr)
-        return lower_bound, upper_bound
-
-    # Calculate bounds for each status
-    status_bounds = {}
-    for ticket in tickets:
-        for status, time in ticket['cycle_times'].items():
-            if status not in status_bounds:
-                status_bounds[status] = []
-            status_bounds[status].append(time.total_seconds())
+    # Flat (ticket, status, seconds) triples with statuses as integer codes:
+    # one entry per status a ticket actually entered, so no padding is needed
+    statuses = sorted({status for ticket in tickets for status in ticket['cycle_times']})
+    if not statuses:
+        return list(tickets), []
+    status_idx = {status: i for i, status in enumerate(statuses)}
+    status_counts = [len(ticket['cycle_times']) for ticket in tickets]
+    total = sum(status_counts)
+    rows = np.repeat(np.arange(len(tickets)), status_counts)
+    cols = np.fromiter((status_idx[status] for ticket in tickets for status in ticket['cycle_times']), dtype=np.intp, count=total)
+    values = np.fromiter((time.total_seconds() for ticket in tickets for time in ticket['cycle_times'].values()), dtype=np.float64, count=total)
 
-    for status, times in status_bounds.items():
-        status_bounds[status] = calculate_iqr_bounds(times)
+    # Sorting by (status, seconds) lays each status out as one contiguous
+    # ascending run, so every nearest-rank quartile is a direct index into
+    # it. Nearest-rank avoids interpolating between neighbours; the IQR
+    # multiplier makes the bounds insensitive to that difference.
+    sorted_values = values[np.lexsort((values, cols))]
+    counts = np.bincount(cols, minlength=len(statuses))
+    starts = np.cumsum(counts) - counts
+    ranks = starts + np.around(np.array([[0.25], [0.75]]) * (counts - 1)).astype(np.intp)
+    q1, q3 = sorted_values[ranks]
+    upper_bounds = q3 + iqr_multiplier * (q3 - q1)
 
-    # Filter out outliers
-    filtered_tickets = []
-    removed_outliers = []
-    for ticket in tickets:
-        is_outlier = False
-        outlier_statuses = []
-        for status, time in ticket['cycle_times'].items():
-            lower_bound, upper_bound = status_bounds[status]
-            if time.total_seconds() > upper_bound:  # Only remove long-running outliers
-                is_outlier = True
-                outlier_statuses.append(status)
-        
-        if is_outlier:
-            removed_outliers.append(ticket)
-            print(f"Removed outlier: Ticket {ticket['key']}")
-            for status in outlier_statuses:
-                print(f"  Status: {status}, Time: {ticket['cycle_times'][status]}, Upper bound: {timedelta(seconds=status_bounds[status][1])}")
-        else:
-            filtered_tickets.append(ticket)
+    # Only remove long-running outliers. Large histories go through the
+    # compiled kernel, which stops at each ticket's first flagged status.
+    offsets = np.concatenate(([0], np.cumsum(status_counts)))
+    if outlier_mask is not None and len(tickets) >= OUTLIER_JIT_THRESHOLD:
+        is_outlier = outlier_mask(offsets, cols, values, upper_bounds)
+    else:
+        exceeds = values > upper_bounds[cols]
+        is_outlier = np.bincount(rows, weights=exceeds, minlength=len(tickets)) > 0
+
+    ticket_array = np.empty(len(tickets), dtype=object)
+    ticket_array[:] = tickets
+    filtered_tickets = ticket_array[~is_outlier].tolist()
+    removed_outliers = ticket_array[is_outlier].tolist()
+
+    # Triples are ordered by ticket, so each removed ticket's statuses are
+    # one contiguous slice
+    for i in np.flatnonzero(is_outlier):
+        ticket = tickets[i]
+        print(f"Removed outlier: Ticket {ticket['key']}")
+        ticket_cols = cols[offsets[i]:offsets[i + 1]]
+        ticket_values = values[offsets[i]:offsets[i + 1]]
+        for j in ticket_cols[ticket_values > upper_bounds[ticket_cols]]:
+            status = statuses[j]
+            print(f"  Status: {status}, Time: {ticket['cycle_times'][status]}, Upper bound: {timedelta(seconds=upper_bounds[j])}")
 
     logger.info(f"Removed {len(removed_outliers)} outliers")
     return filtered_tickets, removed_outliers
@@ -138,7 +181,7 @@ def main():
     historical_filter_id = prompt_for_filter(jira_manager, "Select the filter for historical data:")
     
     # Fetch tickets using the filter ID
-    tickets = jira_manager.get_ticket_data(historical_filter_id)
+    tickets = jira_manager.get_ticket_data(historical_filter_id, need_changelog=True)
     
     if not tickets:
         logger.error("No tickets found in the filter. Exiting.")
@@ -170,7 +213,16 @@ def main():
     if df_items is None or df_points is None:
         logger.error("No data available for forecasting. Exiting.")
         return
-    
+
+    simulate_items = make_cached_simulation(forecaster, df_items)
+    simulate_points = make_cached_simulation(forecaster, df_points)
+
+    actions = {
+        "1": lambda: forecast_completed(simulate_items, simulate_points),
+        "2": lambda: forecast_completion_time(simulate_items, simulate_points),
+        "3": lambda: forecast_backlog_completion(jira_manager, forecaster, df_items, df_points),
+        "4": lambda: display_individual_metrics(jira_manager, tickets),
+    }
 
     while True:
         print("\nChoose an analysis option:")
@@ -182,14 +234,8 @@ def main():
 
         choice = input("Enter your choice (1-5): ")
 
-        if choice == "1":
-            forecast_completed(forecaster, df_items, df_points)
-        elif choice == "2":
-            forecast_completion_time(forecaster, df_items, df_points)
-        elif choice == "3":
-            forecast_backlog_completion(jira_manager, forecaster, df_items, df_points)
-        elif choice == "4":
-            display_individual_metrics(jira_manager, tickets)
+        if choice in actions:
+            actions[choice]()
         elif choice == "5":
             logger.info("Exiting the program.")
             break
@@ -197,29 +243,30 @@ def main():
             logger.warning("Invalid choice. Please try again.")
             
 
-def forecast_completed(forecaster: MonteCarloForecaster, df_items: pd.DataFrame, df_points: pd.DataFrame):
+def forecast_completed(simulate_items: Callable, simulate_points: Callable):
     forecast_points = input("Do you want to forecast using story points? (y/n): ").lower() == "y"
-    df = df_points if forecast_points else df_items
+    simulate = simulate_points if forecast_points else simulate_items
     unit = "story points" if forecast_points else "items"
     
     print(f"\nProjected number of completed {unit}:")
-    for days in [14, 28, 42, 56, 70, 84, 98, 112, 136]:
-        projected = forecaster.run_simulation(df, num_days=days)
-        sprint_count = int(days / 14)
-        enddate = (datetime.now() + timedelta(days=days)).date()
+    forecasts = simulate(day_checkpoints=(14, 28, 42, 56, 70, 84, 98, 112, 136))
+    today = datetime.now().date()
+    for days, projected in forecasts.items():
+        sprint_count = days // 14
+        enddate = today + timedelta(days=days)
         print(f"\n{sprint_count} sprints, ending {enddate} ({days} days from now):")
         print(f"  50th percentile: {projected[0]:.0f}")
         print(f"  75th percentile: {projected[1]:.0f}")
         print(f"  85th percentile: {projected[2]:.0f}")
         print(f"  95th percentile: {projected[3]:.0f}")
 
-def forecast_completion_time(forecaster: MonteCarloForecaster, df_items: pd.DataFrame, df_points: pd.DataFrame):
+def forecast_completion_time(simulate_items: Callable, simulate_points: Callable):
     forecast_points = input("Do you want to forecast using story points? (y/n): ").lower() == "y"
-    df = df_points if forecast_points else df_items
+    simulate = simulate_points if forecast_points else simulate_items
     unit = "story points" if forecast_points else "items"
     
     target = float(input(f"Enter the number of {unit} to complete: "))
-    days_to_target = forecaster.run_simulation(df, target_count=target)
+    days_to_target = simulate(target_count=target)
     
     print(f"\nEstimated days to complete {target:.0f} {unit}:")
     print(f"50% chance of completion within: {days_to_target[0]:.0f} days")
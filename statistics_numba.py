@@ -0,0 +1,43 @@
+import numpy as np
+from numba import njit, prange
+
+
+@njit(cache=True)
+def group_cycle_stats(codes, seconds, n_groups):
+    counts = np.zeros(n_groups, dtype=np.int64)
+    sums = np.zeros(n_groups)
+    mins = np.full(n_groups, np.inf)
+    maxs = np.full(n_groups, -np.inf)
+    argmins = np.zeros(n_groups, dtype=np.int64)
+    argmaxs = np.zeros(n_groups, dtype=np.int64)
+    for i in range(len(codes)):
+        g = codes[i]
+        s = seconds[i]
+        counts[g] += 1
+        sums[g] += s
+        if s < mins[g]:
+            mins[g] = s
+            argmins[g] = i
+        if s > maxs[g]:
+            maxs[g] = s
+            argmaxs[g] = i
+
+    means = sums / np.maximum(counts, 1)
+    sq_dev = np.zeros(n_groups)
+    for i in range(len(codes)):
+        d = seconds[i] - means[codes[i]]
+        sq_dev[codes[i]] += d * d
+    stds = np.sqrt(sq_dev / np.maximum(counts, 1))
+    return counts, means, stds, mins, maxs, argmins, argmaxs
+
+
+@njit(parallel=True, cache=True)
+def outlier_mask(offsets, cols, values, upper):
+    n = len(offsets) - 1
+    out = np.zeros(n, dtype=np.bool_)
+    for i in prange(n):
+        for k in range(offsets[i], offsets[i + 1]):
+            if values[k] > upper[cols[k]]:
+                out[i] = True
+                break
+    return out